@@ -1,6 +1,7 @@
 # genlock_app.py  (replace your existing file with this)
 import tkinter as tk
 import threading
+import socket
 import subprocess
 import sys
 import os
@@ -12,6 +13,39 @@ except Exception:
     psutil = None
 
 APP_SCRIPT = "genlock_core.py"  # name of the core script (or its exe when frozen)
+CONTROL_ADDR = ("127.0.0.1", 54322)  # genlock_core's control socket
+POLL_FAST_MS = 1000       # status poll interval right after a state change
+POLL_SLOW_MS = 5000       # status poll interval once the state has settled
+POLL_SETTLE_SECONDS = 30  # unchanged this long => switch to the slow interval
+
+_last_state = object()  # last observed (running, pid); sentinel until the first poll
+_stable_since = 0.0     # monotonic time when _last_state was first seen
+_poll_job = None       # pending root.after id for update_status_label
+
+def genlock_status():
+    """Return (running, pid) for genlock_core.
+
+    A core that accepts the connection counts as running; pid is None when
+    it is too busy (or still importing) to answer in time.
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.settimeout(0.1)
+    try:
+        if s.connect_ex(CONTROL_ADDR) != 0:
+            return False, None
+        try:
+            s.sendall(b"pid")
+            return True, int(s.recv(32).decode(errors='ignore').strip())
+        except (OSError, ValueError):
+            return True, None
+    except OSError:
+        return False, None
+    finally:
+        s.close()
+
+def genlock_pid():
+    """Return the pid reported by a running genlock_core, or None."""
+    return genlock_status()[1]
 
 def find_genlock_process():
     """Return a psutil.Process for an existing genlock_core process, or None."""
@@ -35,16 +69,31 @@ def find_genlock_process():
             continue
     return None
 
+def schedule_status_update(delay_ms):
+    """(Re)schedule the next status poll, replacing any pending one."""
+    global _poll_job
+    if _poll_job is not None:
+        root.after_cancel(_poll_job)
+    _poll_job = root.after(delay_ms, update_status_label)
+
 def update_status_label():
-    proc = find_genlock_process()
-    if proc:
-        status_label.config(text=f"Running (pid {proc.pid})", fg="#00b894")
+    global _last_state, _stable_since, _poll_job
+    _poll_job = None
+    running, pid = genlock_status()
+    if running:
+        text = f"Running (pid {pid})" if pid else "Running"
+        status_label.config(text=text, fg="#00b894")
         start_btn.config(text="Stop GenLock", bg="#e74c3c")
     else:
         status_label.config(text="Not running", fg="white")
         start_btn.config(text="Start GenLock", bg="#00b894")
-    # schedule next update
-    root.after(1000, update_status_label)
+    # schedule next update; back off while nothing changes
+    now = time.monotonic()
+    if (running, pid) != _last_state:
+        _last_state = (running, pid)
+        _stable_since = now
+    settled = now - _stable_since > POLL_SETTLE_SECONDS
+    schedule_status_update(POLL_SLOW_MS if settled else POLL_FAST_MS)
 
 def start_genlock_background():
     """Start genlock_core in background using subprocess.Popen."""
@@ -62,7 +111,9 @@ def start_genlock_background():
 
     try:
         # use Popen so launcher doesn't block; redirect output to devnull
-        subprocess.Popen([python, script_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # and run headless (no preview window) since nobody sees the output
+        env = dict(os.environ, GENLOCK_UI=os.environ.get("GENLOCK_UI", "0"))
+        subprocess.Popen([python, script_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
         time.sleep(0.4)  # give process a moment to start
     except Exception as e:
         status_label.config(text=f"Start failed: {e}", fg="#ffcc00")
@@ -72,7 +123,11 @@ def stop_genlock():
     if psutil is None:
         status_label.config(text="psutil not installed (can't stop)", fg="#ffcc00")
         return
-    proc = find_genlock_process()
+    pid = genlock_pid()
+    try:
+        proc = psutil.Process(pid) if pid else find_genlock_process()
+    except psutil.NoSuchProcess:
+        proc = None
     if not proc:
         status_label.config(text="Not running", fg="white")
         return
@@ -88,13 +143,17 @@ def stop_genlock():
 
 def start_stop_handler():
     """Called when the Start/Stop button is clicked."""
-    proc = find_genlock_process()
-    if proc:
+    global _stable_since
+    running, _ = genlock_status()
+    if running:
         # it's running -> stop it
         threading.Thread(target=stop_genlock, daemon=True).start()
     else:
         # not running -> start it
         threading.Thread(target=start_genlock_background, daemon=True).start()
+    # state is about to change: poll quickly again
+    _stable_since = time.monotonic()
+    schedule_status_update(POLL_FAST_MS)
 
 # ---------- UI ----------
 root = tk.Tk()
@@ -115,64 +174,5 @@ note = tk.Label(root, text="Start will run the core GenLock process in backgroun
 note.pack(pady=6)
 
 # initial check + periodic updates
-root.after(500, update_status_label)
+schedule_status_update(500)
 root.mainloop()
-# --- begin single-instance + control socket (put this at top of genlock_core.py) ---
-import socket
-import threading
-import sys
-import time
-
-# Configuration for single-instance and control
-_SINGLETON_HOST = "127.0.0.1"
-_SINGLETON_PORT = 54321  # port used to ensure single instance; change if conflict
-_CONTROL_PORT = 54322    # optional control port for a graceful stop
-
-# Try to claim the singleton port. If bind fails => another instance is running.
-_singleton_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-_singleton_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-try:
-    _singleton_sock.bind((_SINGLETON_HOST, _SINGLETON_PORT))
-    _singleton_sock.listen(1)
-except OSError:
-    # Another instance is already running — exit cleanly.
-    print("Another GenLock instance is already running. Exiting.")
-    sys.exit(0)
-
-# Optional: start a control thread to accept simple commands (like "stop")
-def _control_thread():
-    ctrl = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    ctrl.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    try:
-        ctrl.bind((_SINGLETON_HOST, _CONTROL_PORT))
-        ctrl.listen(1)
-    except OSError:
-        # If control port not available, just skip control thread.
-        return
-    while True:
-        try:
-            conn, _ = ctrl.accept()
-            data = conn.recv(1024).decode(errors='ignore').strip().lower()
-            if data == "stop":
-                conn.send(b"stopping")
-                conn.close()
-                # graceful shutdown: raise SystemExit or call a shutdown flag
-                print("Stop command received, exiting.")
-                try:
-                    # attempt graceful exit
-                    sys.exit(0)
-                except SystemExit:
-                    # if sys.exit suppressed, force exit
-                    os._exit(0)
-            else:
-                conn.send(b"unknown")
-                conn.close()
-        except Exception:
-            # continue listening
-            pass
-
-# start control thread (daemon so it won't block exit)
-import threading, os
-t = threading.Thread(target=_control_thread, daemon=True)
-t.start()
-# --- end single-instance + control socket ---
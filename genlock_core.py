@@ -1,74 +1,260 @@
 # genlock.py
+# --- begin single-instance + control socket ---
+import socket
+import threading
+import sys
+import os
+
+# Configuration for single-instance and control
+_SINGLETON_HOST = "127.0.0.1"
+_SINGLETON_PORT = 54321  # port used to ensure single instance; change if conflict
+_CONTROL_PORT = 54322    # optional control port for a graceful stop
+
+def _new_server_socket():
+    """TCP socket whose bind fails if another process already holds the port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if sys.platform == "win32":
+        # on Windows SO_REUSEADDR lets a second process bind a port in use
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+    else:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    return sock
+
+# Try to claim the singleton port. If bind fails => another instance is running.
+_singleton_sock = _new_server_socket()
+try:
+    _singleton_sock.bind((_SINGLETON_HOST, _SINGLETON_PORT))
+    _singleton_sock.listen(1)
+except OSError:
+    # Another instance is already running — exit cleanly.
+    print("Another GenLock instance is already running. Exiting.")
+    sys.exit(0)
+
+# Optional: start a control thread to accept simple commands (like "stop")
+def _control_thread():
+    ctrl = _new_server_socket()
+    try:
+        ctrl.bind((_SINGLETON_HOST, _CONTROL_PORT))
+        ctrl.listen(1)
+    except OSError:
+        # If control port not available, just skip control thread.
+        return
+    while True:
+        try:
+            conn, _ = ctrl.accept()
+            data = conn.recv(1024).decode(errors='ignore').strip().lower()
+            if data == "pid":
+                # lets the launcher check liveness without scanning processes
+                conn.send(str(os.getpid()).encode())
+                conn.close()
+            elif data == "stop":
+                conn.send(b"stopping")
+                conn.close()
+                # graceful shutdown: raise SystemExit or call a shutdown flag
+                print("Stop command received, exiting.")
+                try:
+                    # attempt graceful exit
+                    sys.exit(0)
+                except SystemExit:
+                    # if sys.exit suppressed, force exit
+                    os._exit(0)
+            else:
+                conn.send(b"unknown")
+                conn.close()
+        except Exception:
+            # continue listening
+            pass
+
+# start control thread (daemon so it won't block exit)
+t = threading.Thread(target=_control_thread, daemon=True)
+t.start()
+# --- end single-instance + control socket ---
+
 import cv2
 import mediapipe as mp
 import numpy as np
-import threading
 import time
+import math
 import platform
 import subprocess
+import shutil
 import ctypes
 import queue
 import speech_recognition as sr
 import pyttsx3
 
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
 # -------- configuration --------
-LOCK_HOLD_SECONDS = 0.9        # how long gesture must be held (seconds)
-GESTURE_FRAME_WINDOW = 10     # smoothing window (frames)
+GESTURE_FRAME_WINDOW = 30     # mode-filter window (frames, ~1s at 30fps = hold time)
+GESTURE_VOTE_RATIO = 0.9      # fraction of window that must be a fist to trigger
 VOICE_KEY_PHRASES = ["lock laptop", "lock my laptop", "lock computer", "secure", "lock it"]  # phrases
 CONFIRM_COUNTDOWN = 3         # seconds countdown before locking (set 0 to skip)
 DEBOUNCE_SECONDS = 3          # minimum seconds between locks
+CONFIRM_SPEECH_WAIT = 2       # max seconds the countdown waits for pending speech
+ROI_MARGIN = 0.5              # padding around last hand bbox (fraction of its size)
+ROI_MIN_SIZE = 32             # below this (pixels) fall back to the full frame
+CAPTURE_SIZE = (640, 480)     # requested camera resolution
+CAPTURE_FPS = 30              # requested camera frame rate
+INFER_WIDTH = 320             # frame width fed to MediaPipe (display stays native)
+SHOW_UI = os.environ.get("GENLOCK_UI", "1") == "1"  # preview window (0 = headless)
+UI_FRAME_STRIDE = 3           # refresh the preview every Nth frame
 # --------------------------------
 
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 
-engine = pyttsx3.init()  # text-to-speech for confirmation feedback
+# set by the voice thread / gesture logic to ask the main thread to lock
+lock_requested = threading.Event()
+trigger_source = None  # (source, payload) of the latest request, for logging
+
+# phrases waiting to be spoken by the TTS worker thread
+tts_q = queue.SimpleQueue()
 
-# thread-safe queue used to notify main thread to lock
-action_q = queue.Queue()
+_tts_lock = threading.Lock()
+_tts_pending = 0          # phrases queued or being spoken
 
 last_lock_time = 0
+_lock_pending = False     # a lock was requested and hasn't fired yet
+_lock_accepted_at = None  # monotonic time the pending lock was accepted
+lock_deadline = None      # monotonic time at which a pending lock fires
+_countdown_said = None    # last countdown number announced
 
-def speak(text):
+def _tts_worker():
+    global _tts_pending
+    # the engine lives on this thread so runAndWait() never blocks the frame loop
     try:
-        engine.say(text)
-        engine.runAndWait()
+        engine = pyttsx3.init()  # text-to-speech for confirmation feedback
     except Exception as e:
+        # keep consuming phrases so a pending lock doesn't wait on speech forever
         print("TTS error:", e)
+        engine = None
+    while True:
+        text = tts_q.get()
+        try:
+            if engine is not None:
+                engine.say(text)
+                engine.runAndWait()
+        except Exception as e:
+            print("TTS error:", e)
+        finally:
+            with _tts_lock:
+                _tts_pending -= 1
+
+def request_lock(src, payload):
+    """Ask the main loop to lock; safe to call from any thread."""
+    global trigger_source
+    trigger_source = (src, payload)
+    lock_requested.set()
+
+def speak(text):
+    """Queue text for the TTS thread (non-blocking)."""
+    global _tts_pending
+    with _tts_lock:
+        _tts_pending += 1
+    tts_q.put(text)
+
+def tts_busy():
+    """True while any phrase is queued or still being spoken."""
+    return _tts_pending > 0
+
+def _drop_queued_speech():
+    """Discard phrases that haven't started playing yet."""
+    global _tts_pending
+    with _tts_lock:
+        while True:
+            try:
+                tts_q.get_nowait()
+            except queue.Empty:
+                break
+            _tts_pending -= 1
 
 def lock_workstation():
-    """Call platform-specific lock."""
-    global last_lock_time
-    now = time.time()
+    """Schedule a platform lock after the confirmation countdown."""
+    global last_lock_time, _lock_pending, _lock_accepted_at
+    now = time.monotonic()
+    if _lock_pending:
+        print("Lock already pending.")
+        return
     if now - last_lock_time < DEBOUNCE_SECONDS:
         print("Lock suppressed (debounce).")
         return
     last_lock_time = now
+    _lock_pending = True
+    _lock_accepted_at = now
+    # optional audible confirmation (only for requests that will actually lock)
+    speak("Lock command received")
+    poll_lock()
+
+def poll_lock():
+    """Announce the countdown and lock once it expires; called every frame."""
+    global _lock_pending, _lock_accepted_at, lock_deadline, _countdown_said
+    if not _lock_pending:
+        return
+    now = time.monotonic()
+    if lock_deadline is None:
+        # start counting once the confirmation has been spoken, so the
+        # spoken countdown doesn't queue up behind it and lag the real one;
+        # but never let speech hold the lock back longer than CONFIRM_SPEECH_WAIT
+        if tts_busy() and now - _lock_accepted_at < CONFIRM_SPEECH_WAIT:
+            return
+        lock_deadline = now + CONFIRM_COUNTDOWN
+    remaining = math.ceil(lock_deadline - now)
+    if remaining > 0:
+        # optional confirmation countdown; a number is skipped rather than
+        # queued if the previous phrase is still playing
+        if remaining != _countdown_said and not tts_busy():
+            _countdown_said = remaining
+            speak(f"Locking in {remaining}")
+        return
+    _lock_pending = False
+    _lock_accepted_at = None
+    lock_deadline = None
+    _countdown_said = None
+    # nothing left to announce once the screen is locked
+    _drop_queued_speech()
+    _platform_lock()
+
+def _find_lock_commands(plat):
+    """Resolve the installed external lock commands, in fallback order, once at import."""
+    if plat == "linux":
+        # try loginctl or gnome-screensaver-command,
+        # fallback to xdg-screensaver (may not lock)
+        candidates = [["loginctl", "lock-session"],
+                      ["gnome-screensaver-command", "-l"],
+                      ["xdg-screensaver", "lock"]]
+    elif plat == "darwin":
+        # macOS - use AppleScript to lock the screen
+        candidates = [["/usr/bin/osascript", "-e", 'tell application "System Events" to keystroke "q" using {control down, command down}']]
+    else:
+        return []
+    return [cmd for cmd in candidates if shutil.which(cmd[0])]
 
-    # optional confirmation countdown
-    if CONFIRM_COUNTDOWN > 0:
-        for i in range(CONFIRM_COUNTDOWN, 0, -1):
-            speak(f"Locking in {i}")
-            time.sleep(1)
+_PLATFORM = platform.system().lower()
+_LOCK_CMDS = _find_lock_commands(_PLATFORM)
 
-    plat = platform.system().lower()
+def _run_lock_commands():
+    # each locker is only spawned if the previous one failed
+    for cmd in _LOCK_CMDS:
+        try:
+            subprocess.run(cmd, check=True)
+            return
+        except Exception as e:
+            print("Lock command failed:", cmd[0], e)
+    print("Lock failed: no lock command succeeded.")
+
+def _platform_lock():
+    """Call platform-specific lock."""
     try:
-        if plat == "windows":
+        if _PLATFORM == "windows":
             # Windows
             ctypes.windll.user32.LockWorkStation()
-        elif plat == "linux":
-            # try loginctl or gnome-screensaver-command
-            try:
-                subprocess.run(["loginctl", "lock-session"], check=True)
-            except Exception:
-                try:
-                    subprocess.run(["gnome-screensaver-command", "-l"], check=True)
-                except Exception:
-                    # fallback to xdg-screensaver (may not lock)
-                    subprocess.run(["xdg-screensaver", "lock"])
-        elif plat == "darwin":
-            # macOS - use AppleScript to lock the screen
-            subprocess.run(["/usr/bin/osascript", "-e", 'tell application "System Events" to keystroke "q" using {control down, command down}'])
+        elif _LOCK_CMDS:
+            # run the fallback chain off the frame loop so it never blocks
+            threading.Thread(target=_run_lock_commands, daemon=True).start()
         else:
             print("Unknown platform - cannot lock automatically.")
     except Exception as e:
@@ -86,23 +272,19 @@ def voice_listener(stop_event):
 
     with mic as source:
         r.adjust_for_ambient_noise(source, duration=1)
+    # keep the calibrated threshold instead of re-adjusting per phrase
+    r.dynamic_energy_threshold = False
     print("Voice listener ready.")
 
-    while not stop_event.is_set():
-        with mic as source:
-            try:
-                print("Listening for command...")
-                audio = r.listen(source, timeout=5, phrase_time_limit=5)
-            except sr.WaitTimeoutError:
-                continue
+    def on_audio(recognizer, audio):
         try:
             # using google recognizer (online). For offline, use VOSK
-            text = r.recognize_google(audio).lower()
+            text = recognizer.recognize_google(audio).lower()
             print("Heard (voice):", text)
             for phrase in VOICE_KEY_PHRASES:
                 if phrase in text:
                     print("Voice trigger detected:", phrase)
-                    action_q.put(("voice", text))
+                    request_lock("voice", text)
                     break
         except sr.UnknownValueError:
             pass
@@ -111,123 +293,297 @@ def voice_listener(stop_event):
         except Exception as e:
             print("Voice thread error:", e)
 
+    # the microphone stream stays open for the listener's lifetime
+    stop_listening = r.listen_in_background(mic, on_audio, phrase_time_limit=5)
+    print("Listening for command...")
+    stop_event.wait()
+    stop_listening(wait_for_stop=False)
+
 # ---- Gesture utilities ----
-def landmarks_to_np(landmarks, w, h):
-    pts = []
-    for lm in landmarks.landmark:
-        pts.append((int(lm.x * w), int(lm.y * h)))
-    return pts
-
-def is_finger_extended(pts, tip_idx, pip_idx, mcp_idx):
-    # simple heuristic independent of orientation: compare distances
-    tip = np.array(pts[tip_idx])
-    pip = np.array(pts[pip_idx])
-    mcp = np.array(pts[mcp_idx])
-    # if distance from tip to wrist (mcp) is > distance pip->mcp, it's extended
-    return np.linalg.norm(tip - mcp) > np.linalg.norm(pip - mcp) * 1.05
+def landmarks_to_np(landmarks, w, h, x0=0, y0=0):
+    """Return landmarks as a (21, 2) int32 array of pixel coordinates.
+
+    w, h is the size of the image the landmarks were found in; x0, y0 its
+    offset inside the full frame (non-zero when a crop was processed).
+    """
+    pts = np.array([(lm.x, lm.y) for lm in landmarks.landmark], dtype=np.float32)
+    pts *= np.array([w, h], dtype=np.float32)
+    pts += np.array([x0, y0], dtype=np.float32)
+    return pts.astype(np.int32)
+
+def hand_roi(pts, w, h):
+    """Padded (x0, y0, x1, y1) box around pts clipped to the frame, or None."""
+    (x0, y0), (x1, y1) = pts.min(0), pts.max(0)
+    pad = int(max(x1 - x0, y1 - y0) * ROI_MARGIN)
+    x0, y0 = max(int(x0) - pad, 0), max(int(y0) - pad, 0)
+    x1, y1 = min(int(x1) + pad, w), min(int(y1) + pad, h)
+    if x1 - x0 < ROI_MIN_SIZE or y1 - y0 < ROI_MIN_SIZE:
+        return None
+    return x0, y0, x1, y1
+
+# (tip, pip, mcp) landmark indices for each finger (MediaPipe):
+# thumb: tip 4, ip 3, mcp 2
+# index: tip 8, pip 6, mcp 5
+# middle: tip 12, pip 10, mcp 9
+# ring: tip 16, pip 14, mcp 13
+# pinky: tip 20, pip 18, mcp 17
+_FINGER_IDX = np.array([[4,3,2],[8,6,5],[12,10,9],[16,14,13],[20,18,17]])
+_EXTENDED_RATIO_SQ = 1.05 ** 2
 
 def is_closed_fist(pts):
-    # indices for landmarks (MediaPipe):
-    # thumb: tip 4, ip 3, mcp 2
-    # index: tip 8, pip 6, mcp 5
-    # middle: tip 12, pip 10, mcp 9
-    # ring: tip 16, pip 14, mcp 13
-    # pinky: tip 20, pip 18, mcp 17
-    checks = []
-    fingers = [(8,6,5),(12,10,9),(16,14,13),(20,18,17)]
-    for tip,pip,mcp in fingers:
-        checks.append(is_finger_extended(pts, tip, pip, mcp))
-    # thumb check using different indices
-    thumb_extended = is_finger_extended(pts, 4, 3, 2)
-    extended_count = sum(checks) + (1 if thumb_extended else 0)
+    # simple heuristic independent of orientation: a finger is extended if
+    # distance tip->mcp is > distance pip->mcp (compared squared, all fingers at once)
+    trips = pts[_FINGER_IDX]  # (5, 3, 2)
+    d_tip = trips[:, 0] - trips[:, 2]
+    d_pip = trips[:, 1] - trips[:, 2]
+    extended = (d_tip * d_tip).sum(1) > (d_pip * d_pip).sum(1) * _EXTENDED_RATIO_SQ
     # if very few fingers extended => fist
-    return extended_count <= 1  # adjust threshold if needed
+    return extended.sum() <= 1  # adjust threshold if needed
+
+def _is_closed_fist_loop(pts):
+    # scalar form of is_closed_fist for numba: no temporary arrays
+    ext = 0
+    for i in range(_FINGER_IDX.shape[0]):
+        tip, pip, mcp = _FINGER_IDX[i, 0], _FINGER_IDX[i, 1], _FINGER_IDX[i, 2]
+        dt = (pts[tip, 0] - pts[mcp, 0]) ** 2 + (pts[tip, 1] - pts[mcp, 1]) ** 2
+        dp = (pts[pip, 0] - pts[mcp, 0]) ** 2 + (pts[pip, 1] - pts[mcp, 1]) ** 2
+        if dt > dp * _EXTENDED_RATIO_SQ:
+            ext += 1
+    return ext <= 1
+
+if njit is not None:
+    _is_closed_fist_np = is_closed_fist
+    try:
+        is_closed_fist = njit(cache=True, fastmath=True)(_is_closed_fist_loop)
+        # numba compiles on first call: pay that cost here, not on the first
+        # detected hand, and catch compile/typing errors along with the rest
+        is_closed_fist(np.zeros((21, 2), dtype=np.int32))
+    except Exception as e:
+        # e.g. no writable cache location when frozen; keep the NumPy version
+        print("numba unavailable, using NumPy fist check:", e)
+        is_closed_fist = _is_closed_fist_np
+
+def input_buffer_size(w, h):
+    """Bytes needed for the largest RGB input prepare_input makes from a w x h frame."""
+    # inputs are at most INFER_WIDTH wide (or the frame width) and never taller than the frame
+    return min(w, INFER_WIDTH) * h * 3
+
+def prepare_input(frame, box, use_ocl=False, buf=None):
+    """Crop frame to box, downscale it and return a contiguous RGB array.
+
+    buf is a flat uint8 array of input_buffer_size() bytes; the result is a
+    C-contiguous view into it, so no array is allocated per frame. The OpenCL
+    path ignores buf: downloading a UMat always returns a new array.
+    """
+    x0, y0, x1, y1 = box
+    cw = x1 - x0
+    # the hand model runs at 256x256 anyway; downscale wide inputs (the full
+    # frame) before conversion, but never shrink a hand crop below INFER_WIDTH
+    scale = INFER_WIDTH / cw if cw > INFER_WIDTH else None
+    if use_ocl:
+        # resize + colour conversion run as OpenCL kernels (T-API); only the
+        # small RGB result is downloaded, since MediaPipe needs a numpy array.
+        # only the crop is uploaded, not the whole frame
+        small = cv2.UMat(frame[y0:y1, x0:x1])
+        if scale is not None:
+            small = cv2.resize(small, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2RGB).get()
+    small = frame[y0:y1, x0:x1]
+    if scale is not None:
+        small = cv2.resize(small, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    # convert straight into the reused buffer; the ROI size varies per frame,
+    # so take a prefix view of the flat buffer with this frame's shape
+    if buf is None:
+        out = np.empty(small.shape, dtype=np.uint8)
+    else:
+        out = buf[:small.size].reshape(small.shape)
+    cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=out)
+    return out
+
+# ---- Hand inference thread ----
+def _put_latest(q, item):
+    """Put item into a 1-slot queue; return whatever it displaced, or None."""
+    try:
+        dropped = q.get_nowait()
+    except queue.Empty:
+        dropped = None
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        pass
+    return dropped
+
+def hand_worker(mp_hand, in_q, out_q, buf_pool, stop_event):
+    """Run MediaPipe on the newest (frame_rgb, box, buf) and publish (results, box).
+
+    buf (the flat buffer behind frame_rgb) goes back to buf_pool once
+    MediaPipe has copied the frame.
+    """
+    process = mp_hand.process
+    while not stop_event.is_set():
+        try:
+            frame_rgb, box, buf = in_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        try:
+            results = process(frame_rgb)
+        except Exception as e:
+            print("Hand tracking error:", e)
+            continue
+        finally:
+            if buf is not None:
+                buf_pool.put(buf)
+        _put_latest(out_q, (results, box))
 
 # ---- Main camera loop ----
 def main():
-    cap = cv2.VideoCapture(0)
+    # DirectShow + MJPEG avoids slow uncompressed YUY2 transfers on Windows
+    if _PLATFORM == "windows":
+        cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+    else:
+        cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         print("Cannot open camera")
         return
+    # set FOURCC first; some drivers only honour it before the resolution
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_SIZE[0])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_SIZE[1])
+    cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+    # keep only the newest frame so we never process stale ones
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
     stop_event = threading.Event()
     voice_thread = threading.Thread(target=voice_listener, args=(stop_event,), daemon=True)
     voice_thread.start()
+    threading.Thread(target=_tts_worker, daemon=True).start()
 
+    # lite landmark model is plenty for "is it a fist?"; a stricter detection
+    # threshold avoids false palm re-detections while a low tracking one keeps
+    # the tracker attached so the palm detector runs less often
     mp_hand = mp_hands.Hands(static_image_mode=False,
                              max_num_hands=1,
-                             min_detection_confidence=0.5,
-                             min_tracking_confidence=0.5)
+                             model_complexity=0,
+                             min_detection_confidence=0.6,
+                             min_tracking_confidence=0.4)
+
+    # offload preprocessing to the GPU when OpenCL is available
+    use_ocl = cv2.ocl.haveOpenCL()
+    cv2.ocl.setUseOpenCL(use_ocl)
+
+    # bit i set => fist seen i results ago; only the last window bits are kept
+    history_bits = 0
+    roi = None  # hand box from the previous frame; None => search full frame
+    hand = None  # (landmarks, box) of the last tracked hand, for drawing
+    gesture_detected = False
+    stable = False
+    frame_idx = 0
 
-    frame_history = []
-    gesture_start_time = None
-    last_gesture_state = False
+    # inference overlaps capture/display; 1-slot queues keep only the newest item
+    in_q, out_q = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+    # free flat RGB buffers, each big enough for any input; at most one is
+    # queued and one in inference at a time, so the pool settles at ~3
+    buf_pool = queue.SimpleQueue()
+    hand_thread = threading.Thread(target=hand_worker, args=(mp_hand, in_q, out_q, buf_pool, stop_event), daemon=True)
+    hand_thread.start()
+
+    # hoist per-frame attribute/global lookups out of the loop
+    _read = cap.read
+    _pool_get = buf_pool.get_nowait
+    _pool_put = buf_pool.put
+    _result_get = out_q.get_nowait
+    _lock_is_set = lock_requested.is_set
+    _draw = mp_drawing.draw_landmarks
+    _CONN = mp_hands.HAND_CONNECTIONS
+    _putText = cv2.putText
+    _FONT = cv2.FONT_HERSHEY_SIMPLEX
+    _imshow = cv2.imshow
+    _waitKey = cv2.waitKey
+    _Empty = queue.Empty
+    _WMASK = (1 << GESTURE_FRAME_WINDOW) - 1
+    _TRIGGER_VOTES = GESTURE_FRAME_WINDOW * GESTURE_VOTE_RATIO
 
     try:
         while True:
-            ret, frame = cap.read()
+            ret, frame = _read()
             if not ret:
                 break
             h, w = frame.shape[:2]
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = mp_hand.process(frame_rgb)
+            # only look around last frame's hand, so the palm detector
+            # rarely has to scan the whole image
+            x0, y0, x1, y1 = roi if roi is not None else (0, 0, w, h)
+            rgb_buf = None
+            if not use_ocl:  # the OpenCL path can't write into our buffers
+                buf_size = input_buffer_size(w, h)
+                try:
+                    rgb_buf = _pool_get()
+                except _Empty:
+                    pass
+                if rgb_buf is None or rgb_buf.size < buf_size:
+                    # first frames, or the capture size grew
+                    rgb_buf = np.empty(buf_size, dtype=np.uint8)
+            frame_rgb = prepare_input(frame, (x0, y0, x1, y1), use_ocl, rgb_buf)
+            dropped = _put_latest(in_q, (frame_rgb, (x0, y0, x1, y1), rgb_buf))
+            if dropped is not None and dropped[2] is not None:
+                _pool_put(dropped[2])
 
-            gesture_detected = False
-            if results.multi_hand_landmarks:
-                # use first detected hand
-                hand_landmarks = results.multi_hand_landmarks[0]
-                pts = landmarks_to_np(hand_landmarks, w, h)
-                # draw
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            # gesture state only advances when a new inference result is in
+            try:
+                results, (x0, y0, x1, y1) = _result_get()
+            except _Empty:
+                results = None
+            if results is not None:
+                gesture_detected = False
+                roi = None
+                hand = None
+                if results.multi_hand_landmarks:
+                    # use first detected hand
+                    hand_landmarks = results.multi_hand_landmarks[0]
+                    pts = landmarks_to_np(hand_landmarks, x1 - x0, y1 - y0, x0, y0)
+                    roi = hand_roi(pts, w, h)
+                    hand = (hand_landmarks, (x0, y0, x1, y1))
 
-                try:
-                    if is_closed_fist(pts):
-                        gesture_detected = True
-                    else:
+                    try:
+                        if is_closed_fist(pts):
+                            gesture_detected = True
+                        else:
+                            gesture_detected = False
+                    except Exception as e:
+                        # if something indexing fails
                         gesture_detected = False
-                except Exception as e:
-                    # if something indexing fails
-                    gesture_detected = False
-
-            # smoothing: use last N frames
-            frame_history.append(gesture_detected)
-            if len(frame_history) > GESTURE_FRAME_WINDOW:
-                frame_history.pop(0)
-            # majority vote
-            votes = sum(frame_history)
-            stable = votes >= (GESTURE_FRAME_WINDOW * 0.7)  # 70% frames positive
-
-            # manage hold time
-            if stable and not last_gesture_state:
-                gesture_start_time = time.time()
-                last_gesture_state = True
-            elif stable and last_gesture_state:
-                # check hold duration
-                if time.time() - gesture_start_time >= LOCK_HOLD_SECONDS:
+
+                # smoothing: use last N frames (popcount of the history bitmask)
+                history_bits = ((history_bits << 1) | gesture_detected) & _WMASK
+                votes = history_bits.bit_count()
+                # mode filter: the window spans the hold time, so a near-unanimous
+                # vote both suppresses transient false positives and enforces the hold
+                stable = votes > _TRIGGER_VOTES
+                if stable:
                     # trigger lock
                     print("Gesture trigger detected (fist).")
-                    action_q.put(("gesture", "fist"))
-                    last_gesture_state = False
-                    frame_history.clear()
-            elif not stable:
-                last_gesture_state = False
-                gesture_start_time = None
-
-            # process any actions from action_q
-            try:
-                src, payload = action_q.get_nowait()
-                print("Action from:", src, payload)
-                # optional audible confirmation
-                speak("Lock command received")
+                    request_lock("gesture", "fist")
+                    history_bits = 0
+
+            # process a pending lock request
+            if _lock_is_set():
+                lock_requested.clear()
+                print("Action from:", *trigger_source)
                 lock_workstation()
-            except queue.Empty:
-                pass
+            poll_lock()
 
-            # display status
-            status_text = f"Gesture={gesture_detected}  Stable={stable}"
-            cv2.putText(frame, status_text, (10,30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
-            cv2.imshow("GenLock - press q to quit", frame)
-            key = cv2.waitKey(1) & 0xFF
+            if not SHOW_UI:
+                continue
+            frame_idx += 1
+            if frame_idx % UI_FRAME_STRIDE == 0:
+                if hand is not None:
+                    # draw the latest result (landmarks are normalized to the processed region)
+                    hand_landmarks, (x0, y0, x1, y1) = hand
+                    _draw(frame[y0:y1, x0:x1], hand_landmarks, _CONN)
+                # display status
+                status_text = f"Gesture={gesture_detected}  Stable={stable}"
+                _putText(frame, status_text, (10,30), _FONT, 0.7, (0,255,0), 2)
+                _imshow("GenLock - press q to quit", frame)
+            key = _waitKey(1) & 0xFF
             if key == ord('q'):
                 break
 
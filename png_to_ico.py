@@ -15,6 +15,12 @@ img = Image.open(input_file).convert("RGBA")
 # preferred icon sizes for Windows
 sizes = [(256,256),(128,128),(64,64),(48,48),(32,32),(16,16)]
 
+# don't upscale past the source image
+sizes = [s for s in sizes if s[0] <= img.width and s[1] <= img.height] or [img.size]
+
+# resize once per size with LANCZOS so PIL doesn't resample internally
+imgs = [img.resize(s, Image.LANCZOS) for s in sizes]
+
 # save as .ico with multiple sizes
-img.save(output_file, format='ICO', sizes=sizes)
+imgs[0].save(output_file, format='ICO', sizes=sizes, append_images=imgs[1:])
 print("Saved:", output_file)